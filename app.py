@@ -1,9 +1,21 @@
+import itertools
+import logging
+import math
 import os
+import random
+import re
+import socket
+import threading
 import time
-import requests
+from concurrent.futures import Future, ThreadPoolExecutor
+from decimal import Decimal
+import orjson
+import httpx
 import psycopg2
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
 from flask import Flask, request, jsonify, abort
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
 from dotenv import load_dotenv
 from kiwi_client import resolve_location, search_multimodal
@@ -12,7 +24,7 @@ load_dotenv()
 
 
 CONTENT_API_BASE = "https://content-api.sandbox.junction.dev"
-API_KEY = os.getenv("CONTENT_API_KEY")
+API_KEY = os.getenv("CONTENT_API_KEY", "")
 
 DB_CONFIG = {
     "host": os.getenv("DB_HOST"),
@@ -22,14 +34,208 @@ DB_CONFIG = {
     "dbname": os.getenv("DB_NAME"),
 }
 
+# Offer polling backs off exponentially from POLL_BASE up to POLL_CAP seconds
+# and gives up after POLL_TIMEOUT. POLL_INTERVAL_SEC and MAX_POLL_ATTEMPTS (the
+# old fixed-interval settings) still set the cap and the total time budget.
 POLL_INTERVAL = float(os.getenv("POLL_INTERVAL_SEC", 5))
 MAX_POLL_ATTEMPTS = int(os.getenv("MAX_POLL_ATTEMPTS", 12))
+POLL_BASE = float(os.getenv("POLL_BASE_SEC", 0.5))
+POLL_CAP = float(os.getenv("POLL_CAP_SEC", POLL_INTERVAL))
+POLL_TIMEOUT = float(os.getenv("POLL_TIMEOUT_SEC", MAX_POLL_ATTEMPTS * POLL_INTERVAL))
+# Most IATA codes one /places request may resolve (each is an upstream call).
+MAX_PLACES_CODES = 10
+PLACES_CACHE_TTL = float(os.getenv("PLACES_CACHE_TTL_SEC", 600))
+PLACES_CACHE_MAX = int(os.getenv("PLACES_CACHE_MAX", 5000))
+# Location header of a created search: .../{kind}-searches/{id}[/offers][/]
+_FS_RE = re.compile(r"(?:^|/)flight-searches/(flight_search_[^/]+)(?:/offers)?/?$")
+_TS_RE = re.compile(r"(?:^|/)train-searches/(train_search_[^/]+)(?:/offers)?/?$")
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", 2))
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", 20))
+
+# Upstream request bodies are tiny, so disable Nagle to keep small POSTs from
+# waiting on a delayed ACK; keepalive probes catch silently dropped connections.
+_SOCKET_OPTIONS = [
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+
+# One HTTP/2 client for every Content API call: requests to the same origin
+# (search creation, then repeated polls) multiplex over a single TLS connection.
+CONTENT_CLIENT = httpx.Client(
+    base_url=CONTENT_API_BASE,
+    headers={"x-api-key": API_KEY, "Accept": "application/json"},
+    timeout=15.0,
+    # requests followed redirects; keep that so a 3xx isn't treated as a failure.
+    follow_redirects=True,
+    transport=httpx.HTTPTransport(
+        http2=True,
+        retries=3,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        socket_options=_SOCKET_OPTIONS,
+    ),
+)
+
+# Static per-request headers and Content API paths (auth/Accept live on the client).
+_H_JSON = {"Content-Type": "application/json"}
+_H_NOCACHE = {
+    "Cache-Control": "no-cache, no-store, must-revalidate",
+    "Pragma": "no-cache",
+    "Expires": "0",
+}
+_URL_PLACES = "/places"
+_URL_FS = "/flight-searches"
+_URL_TS = "/train-searches"
+_URL_BOOK = "/bookings"
+_URL_CANCEL = "/cancellations/request"
+
+# Fans out multi-code /places lookups; the calls multiplex over CONTENT_CLIENT.
+_PLACES_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="places")
+# IATA code -> (expiry on the monotonic clock, places items); place data is
+# effectively static, so repeat lookups skip the upstream call entirely.
+_places_cache = {}
+_places_cache_lock = threading.Lock()
+
+
+def _orjson_default(obj):
+    """Handle the types Flask's default provider supports but orjson doesn't."""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if hasattr(obj, "__html__"):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider that serializes responses with orjson."""
+
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_orjson_default, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Write orjson's bytes straight into the response, skipping the str round-trip.
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=_orjson_default, option=self.option),
+            mimetype="application/json",
+        )
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+# e.g. PROXY_LOG_LEVEL=WARNING to drop the per-request proxy logs.
+if os.getenv("PROXY_LOG_LEVEL"):
+    app.logger.setLevel(os.getenv("PROXY_LOG_LEVEL").upper())
 CORS(app, resources={r"/*": {"origins": "*"}})
 
 
+_db_pool = None
+_db_pool_lock = threading.Lock()
+
+
+def get_db_pool():
+    """Return the shared Postgres pool, creating it on first use.
+
+    Created lazily so the app can start before the SSH tunnel to the DB is up.
+    """
+    global _db_pool
+    if _db_pool is None:
+        with _db_pool_lock:
+            if _db_pool is None:
+                _db_pool = ThreadedConnectionPool(
+                    DB_POOL_MIN,
+                    DB_POOL_MAX,
+                    cursor_factory=RealDictCursor,
+                    **DB_CONFIG,
+                )
+    return _db_pool
+
+
 def get_db_connection():
-    return psycopg2.connect(**DB_CONFIG, cursor_factory=RealDictCursor)
+    return get_db_pool().getconn()
+
+
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def _single_flight(key, fn, *args):
+    """
+    Run fn(*args) at most once per key at a time. Callers arriving while a run
+    is in flight wait for it and share its result (or exception).
+    """
+    with _inflight_lock:
+        future = _inflight.get(key)
+        owner = future is None
+        if owner:
+            future = _inflight[key] = Future()
+    if not owner:
+        return future.result()
+
+    try:
+        result = fn(*args)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+
+def _post_json(url, body, **kwargs):
+    """POST a JSON body to the Content API, encoded with orjson rather than stdlib json."""
+    return CONTENT_CLIENT.post(
+        url, content=orjson.dumps(body), headers=_H_JSON, **kwargs
+    )
+
+
+def _poll_wait(resp, attempt, deadline):
+    """
+    Sleep before the next poll, never past the deadline. Returns False, without
+    sleeping, once the deadline has passed.
+    """
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        return False
+    time.sleep(min(_poll_delay(resp, attempt), remaining))
+    return True
+
+
+def _poll_delay(resp, attempt):
+    """
+    Seconds to wait before the next poll: the upstream Retry-After (clamped to
+    [POLL_BASE, POLL_CAP], so 0 can't turn the loop into a busy poll) when it
+    sends one, otherwise capped exponential backoff with a little jitter.
+    """
+    retry_after = resp.headers.get("Retry-After")
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            delay = None  # HTTP-date form; fall back to our own backoff
+        if delay is not None and math.isfinite(delay):
+            return max(POLL_BASE, min(POLL_CAP, delay))
+    backoff = min(POLL_CAP, POLL_BASE * (1 << min(attempt - 1, 5)))
+    return backoff + random.random() * 0.5 * POLL_BASE
+
+
+def _json_passthrough(resp):
+    """
+    Relay an upstream JSON response byte-for-byte, skipping decode + re-encode.
+    Returns None when the upstream body isn't JSON so callers can fall back.
+    """
+    if "json" not in resp.headers.get("Content-Type", ""):
+        return None
+    return app.response_class(
+        resp.content, status=resp.status_code, mimetype="application/json"
+    )
 
 
 @app.route("/places", methods=["GET"])
@@ -37,27 +243,72 @@ def get_places():
     """
     Proxy the Content API's places lookup.
     Query params:
-      ?iata=ABC
-    Returns JSON: { items: [ ... ] }
+      ?iata=ABC  or  ?iata=ABC,DEF,GHI
+    Returns JSON: { items: [ ... ] }  (items for all codes, in request order)
     """
-    iata = request.args.get("iata", "").strip().upper()
-    # Mirror the client-side length checks:
-    if len(iata) != 3:
+    codes = []
+    for code in request.args.get("iata", "").split(","):
+        code = code.strip().upper()
+        # Mirror the client-side length checks; IATA codes are 3 ASCII letters.
+        if len(code) == 3 and code.isascii() and code.isalpha() and code not in codes:
+            codes.append(code)
+            if len(codes) > MAX_PLACES_CODES:
+                return (
+                    jsonify(
+                        {
+                            "items": [],
+                            "error": f"At most {MAX_PLACES_CODES} IATA codes per request",
+                        }
+                    ),
+                    400,
+                )
+    if not codes:
         return jsonify({"items": []})
 
-    # Build and call the external API
-    url = f"{CONTENT_API_BASE}/places?filter[iata][eq]={iata}&page[limit]=5"
-    headers = {
-        "x-api-key": API_KEY,
-        "Accept": "application/json",
-    }
-    resp = requests.get(url, headers=headers)
-    if not resp.ok:
-        # On error, return empty items
-        return jsonify({"items": []}), resp.status_code
-
-    data = resp.json()
-    return jsonify({"items": data.get("items", [])})
+    now = time.monotonic()
+    found = {}
+    for code in codes:
+        hit = _places_cache.get(code)
+        if hit and hit[0] > now:
+            found[code] = hit[1]
+    missing = [code for code in codes if code not in found]
+
+    # One code keeps the direct call; several are fetched concurrently.
+    if len(missing) == 1:
+        responses = [_fetch_places(missing[0])]
+    else:
+        responses = list(_PLACES_EXECUTOR.map(_fetch_places, missing))
+
+    for code, resp in zip(missing, responses):
+        if not resp.is_success:
+            # On error, return empty items
+            return jsonify({"items": []}), resp.status_code
+        found[code] = orjson.loads(resp.content).get("items", [])
+        _cache_places(code, found[code], now)
+
+    items = [item for code in codes for item in found[code]]
+    resp = jsonify({"items": items})
+    # Lets the client revalidate with If-None-Match and get an empty 304.
+    resp.add_etag(weak=True)
+    return resp.make_conditional(request)
+
+
+def _cache_places(code, items, now):
+    """Store a code's items, pruning expired entries (then the oldest) when full."""
+    with _places_cache_lock:
+        _places_cache.pop(code, None)
+        if len(_places_cache) >= PLACES_CACHE_MAX:
+            for key in [k for k, (expiry, _) in _places_cache.items() if expiry <= now]:
+                del _places_cache[key]
+        while _places_cache and len(_places_cache) >= PLACES_CACHE_MAX:
+            del _places_cache[next(iter(_places_cache))]
+        _places_cache[code] = (now + PLACES_CACHE_TTL, items)
+
+
+def _fetch_places(iata):
+    return CONTENT_CLIENT.get(
+        _URL_PLACES, params={"filter[iata][eq]": iata, "page[limit]": 5}
+    )
 
 
 @app.route("/flight-search", methods=["POST"])
@@ -75,41 +326,28 @@ def flight_search():
     if not body:
         abort(400, "Invalid JSON")
 
-    create_url = f"{CONTENT_API_BASE}/flight-searches"
-    headers = {
-        "x-api-key": API_KEY,
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-    }
-    app.logger.info(f"Requesting flight search creation with body: {body}")
-    resp = requests.post(create_url, json=body, headers=headers)
-    app.logger.info(f"Flight search creation response status: {resp.status_code}")
-    if not resp.ok:
-        app.logger.error(f"Search creation failed: {resp.text}")
+    create_url = _URL_FS
+    # Payload dumps are DEBUG-only, and only built when they'll be emitted.
+    if app.logger.isEnabledFor(logging.DEBUG):
+        app.logger.debug("Requesting flight search creation with body: %s", body)
+    resp = _post_json(create_url, body)
+    app.logger.info("Flight search creation response status: %s", resp.status_code)
+    if not resp.is_success:
+        app.logger.error("Search creation failed: %s", resp.text)
         abort(resp.status_code, f"Search creation failed: {resp.text}")
 
     loc = resp.headers.get("Location", "")
-    app.logger.info(f"Location header from flight search creation: {loc}")
-
-    match = None
-    if loc:
-        parts = loc.strip("/").split("/")
-        # Expecting .../flight-searches/{flight_search_id}/offers OR .../flight-searches/{flight_search_id}
-        if len(parts) >= 2 and parts[-1] == "offers" and parts[-3] == "flight-searches":
-            # Format: .../flight-searches/THE_ID/offers
-            potential_match = parts[-2]
-            if potential_match.startswith("flight_search_"):
-                match = potential_match
-        elif len(parts) >= 1 and parts[-2] == "flight-searches":
-            # Format: .../flight-searches/THE_ID
-            potential_match = parts[-1]
-            if potential_match.startswith("flight_search_"):
-                match = potential_match
-
-    app.logger.info(f"Extracted flight_search_id (match): {match}")
+    app.logger.info("Location header from flight search creation: %s", loc)
+
+    m = _FS_RE.search(loc)
+    match = m.group(1) if m else None
+
+    app.logger.info("Extracted flight_search_id (match): %s", match)
     if not match:
         app.logger.error(
-            f"Could not reliably extract flight_search_id from Location: {loc}. Extracted: {match}"
+            "Could not reliably extract flight_search_id from Location: %s. Extracted: %s",
+            loc,
+            match,
         )
         abort(
             500,
@@ -121,32 +359,36 @@ def flight_search():
 
 
 def poll_for_offers(search_id):
-    """Poll the content API until offers are ready or we hit max attempts."""
-    app.logger.info(f"Polling for offers with search_id: {search_id}")
-    url = f"{CONTENT_API_BASE}/flight-searches/{search_id}/offers"
-    app.logger.info(f"Polling URL: {url}")
-    headers = {
-        "x-api-key": API_KEY,
-        "Accept": "application/json",
-        "Cache-Control": "no-cache, no-store, must-revalidate",
-        "Pragma": "no-cache",
-        "Expires": "0",
-    }
-    attempts = 0
-    while True:
-        attempts += 1
-        resp = requests.get(url, headers=headers)
+    """Poll for flight offers, sharing one poll loop per search_id across callers."""
+    return _single_flight(("flight", search_id), _poll_for_offers, search_id)
+
+
+def _poll_for_offers(search_id):
+    """Poll the content API until offers are ready or POLL_TIMEOUT runs out."""
+    app.logger.info("Polling for offers with search_id: %s", search_id)
+    url = f"{_URL_FS}/{search_id}/offers"
+    app.logger.info("Polling URL: %s", url)
+    deadline = time.monotonic() + POLL_TIMEOUT
+    for attempts in itertools.count(1):
+        resp = CONTENT_CLIENT.get(url, headers=_H_NOCACHE)
         if resp.status_code == 200:
-            text = resp.text.strip()
-            # sometimes empty / non-JSON
-            if text.startswith("{") and text.endswith("}"):
-                return resp.json()
-            return None
-        elif resp.status_code == 202 and attempts < MAX_POLL_ATTEMPTS:
-            time.sleep(POLL_INTERVAL)
-            continue
+            try:
+                return orjson.loads(resp.content)
+            except orjson.JSONDecodeError:
+                # sometimes empty / non-JSON
+                return None
+        elif resp.status_code == 202:
+            # Don't hold the worker for a sleep we won't follow with a poll.
+            if _poll_wait(resp, attempts, deadline):
+                continue
+            break
         else:
             resp.raise_for_status()
+            return None
+    app.logger.warning(
+        "Offers not ready after %.0fs (%s attempts)", POLL_TIMEOUT, attempts
+    )
+    return None
 
 
 @app.route("/bookings", methods=["POST"])
@@ -159,55 +401,48 @@ def create_booking():
         app.logger.error("Create booking: Invalid JSON received.")
         abort(400, "Invalid JSON")
 
-    app.logger.info(f"Received booking payload: {payload}")
+    if app.logger.isEnabledFor(logging.DEBUG):
+        app.logger.debug("Received booking payload: %s", payload)
 
-    url = f"{CONTENT_API_BASE}/bookings"
-    headers = {
-        "x-api-key": API_KEY,
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-    }
+    url = _URL_BOOK
 
-    app.logger.info(f"Proxying booking creation to URL: {url}")
-    resp = requests.post(url, json=payload, headers=headers)
+    app.logger.info("Proxying booking creation to URL: %s", url)
+    resp = _post_json(url, payload)
 
+    app.logger.info("Booking creation response status: %s", resp.status_code)
     # It's good to log the raw response text, especially for errors
-    response_text = resp.text
-    app.logger.info(
-        f"Booking creation response status: {resp.status_code}, Text: {response_text}"
-    )
+    if app.logger.isEnabledFor(logging.DEBUG):
+        app.logger.debug("Booking creation response text: %s", resp.text)
 
-    if not resp.ok:
-        app.logger.error(f"Booking failed: {resp.status_code} - {response_text}")
+    if not resp.is_success:
+        response_text = resp.text
+        app.logger.error("Booking failed: %s - %s", resp.status_code, response_text)
         # Return the actual error message from the Content API if possible
-        try:
-            error_json = resp.json()
-            abort(resp.status_code, description=error_json)
-        except ValueError:  # If response is not JSON
-            abort(
-                resp.status_code,
-                description=f"Booking creation failed: {response_text}",
-            )
-
-    try:
-        response_json = resp.json()
-        return jsonify(response_json)
-    except (
-        ValueError
-    ):  # If successful response is not JSON (should not happen for this API)
-        app.logger.error(
-            f"Booking successful but response was not JSON: {response_text}"
-        )
-        return (
-            jsonify(
-                {
-                    "message": "Booking successful, but response format was unexpected.",
-                    "raw_response": response_text,
-                }
-            ),
+        passthrough = _json_passthrough(resp)
+        if passthrough is not None:
+            return passthrough
+        abort(
             resp.status_code,
+            description=f"Booking creation failed: {response_text}",
         )
 
+    passthrough = _json_passthrough(resp)
+    if passthrough is not None:
+        return passthrough
+
+    # Successful response is not JSON (should not happen for this API)
+    response_text = resp.text
+    app.logger.error("Booking successful but response was not JSON: %s", response_text)
+    return (
+        jsonify(
+            {
+                "message": "Booking successful, but response format was unexpected.",
+                "raw_response": response_text,
+            }
+        ),
+        resp.status_code,
+    )
+
 
 @app.route("/db-data", methods=["GET"])
 def db_data():
@@ -217,12 +452,19 @@ def db_data():
     """
     try:
         conn = get_db_connection()
-        cur = conn.cursor()
-        cur.execute("SELECT * FROM public.bookings LIMIT 20;")
-        rows = cur.fetchall()
-        cur.close()
-        conn.close()
-        return jsonify(rows)
+        try:
+            with conn.cursor() as cur:
+                # Let Postgres encode the rows as one JSON array so no per-row
+                # Python dicts are built; the text is returned as-is.
+                cur.execute(
+                    "SELECT coalesce(json_agg(b), '[]')::text AS rows "
+                    "FROM (SELECT * FROM public.bookings LIMIT 20) b;"
+                )
+                rows = cur.fetchone()["rows"]
+        finally:
+            # Hand the connection back; drop it from the pool if it died.
+            get_db_pool().putconn(conn, close=bool(conn.closed))
+        return app.response_class(rows, mimetype="application/json")
     except psycopg2.OperationalError as e:
         return jsonify({"error": f"Database connection failed: {str(e)}"}), 500
     except Exception as e:
@@ -230,42 +472,52 @@ def db_data():
 
 
 def poll_for_train_offers(train_search_id):
-    """Poll the Content API for train offers until ready or max attempts."""
-    app.logger.info(f"Polling for train offers with train_search_id: {train_search_id}")
-    url = f"{CONTENT_API_BASE}/train-searches/{train_search_id}/offers"
-    app.logger.info(f"Train offers polling URL: {url}")
-    headers = {
-        "x-api-key": API_KEY,
-        "Accept": "application/json",
-        "Cache-Control": "no-cache, no-store, must-revalidate",
-        "Pragma": "no-cache",
-        "Expires": "0",
-    }
-    attempts = 0
-    while True:
-        attempts += 1
-        app.logger.info(f"Train offers polling attempt {attempts}/{MAX_POLL_ATTEMPTS}")
-        resp = requests.get(url, headers=headers)
+    """Poll for train offers, sharing one poll loop per train_search_id across callers."""
+    return _single_flight(
+        ("train", train_search_id), _poll_for_train_offers, train_search_id
+    )
+
+
+def _poll_for_train_offers(train_search_id):
+    """Poll the Content API for train offers until ready or POLL_TIMEOUT runs out."""
+    app.logger.info(
+        "Polling for train offers with train_search_id: %s", train_search_id
+    )
+    url = f"{_URL_TS}/{train_search_id}/offers"
+    app.logger.info("Train offers polling URL: %s", url)
+    deadline = time.monotonic() + POLL_TIMEOUT
+    for attempts in itertools.count(1):
+        app.logger.debug("Train offers polling attempt %s", attempts)
+        resp = CONTENT_CLIENT.get(url, headers=_H_NOCACHE)
         if resp.status_code == 200:
-            text = resp.text.strip()
-            if text.startswith("{") and text.endswith("}"):
-                app.logger.info("Train offers received (200 OK).")
-                return resp.json()
-            app.logger.info(
-                "Train offers received (200 OK) but response was empty/non-JSON."
-            )
-            return None  # Or an empty structure like {"items": []}
-        elif resp.status_code == 202 and attempts < MAX_POLL_ATTEMPTS:
-            app.logger.info(
-                f"Train offers not ready yet (202 Accepted). Waiting {POLL_INTERVAL}s."
-            )
-            time.sleep(POLL_INTERVAL)
-            continue
+            try:
+                offers = orjson.loads(resp.content)
+            except orjson.JSONDecodeError:
+                app.logger.info(
+                    "Train offers received (200 OK) but response was empty/non-JSON."
+                )
+                return None  # Or an empty structure like {"items": []}
+            app.logger.info("Train offers received (200 OK).")
+            return offers
+        elif resp.status_code == 202:
+            app.logger.debug("Train offers not ready yet (202 Accepted).")
+            if _poll_wait(resp, attempts, deadline):
+                continue
+            break
         else:
             app.logger.error(
-                f"Failed to get train offers. Status: {resp.status_code}, Text: {resp.text}"
+                "Failed to get train offers. Status: %s, Text: %s",
+                resp.status_code,
+                resp.text,
             )
             resp.raise_for_status()  # Will raise an HTTPError
+            return None
+    app.logger.warning(
+        "Train offers not ready after %.0fs (%s attempts), giving up.",
+        POLL_TIMEOUT,
+        attempts,
+    )
+    return None
 
 
 @app.route("/train-station-suggestions", methods=["GET"])
@@ -274,19 +526,22 @@ def train_station_suggestions():
     if len(query) < 3:  # Or whatever minimum length makes sense
         return jsonify({"items": []})
 
-    url = f"{CONTENT_API_BASE}/places?filter[name][like]={query}&filter[type][eq]=railway-station&page[limit]=5"
-    headers = {
-        "x-api-key": API_KEY,
-        "Accept": "application/json",
+    url = _URL_PLACES
+    params = {
+        "filter[name][like]": query,
+        "filter[type][eq]": "railway-station",
+        "page[limit]": 5,
     }
-    app.logger.info(f"Fetching train station suggestions for '{query}' from URL: {url}")
+    app.logger.info(
+        "Fetching train station suggestions for '%s' from URL: %s", query, url
+    )
     try:
-        resp = requests.get(url, headers=headers)
+        resp = CONTENT_CLIENT.get(url, params=params)
         resp.raise_for_status()
-        data = resp.json()
+        data = orjson.loads(resp.content)
         return jsonify({"items": data.get("items", [])})
-    except requests.exceptions.RequestException as e:
-        app.logger.error(f"Error fetching train station suggestions: {e}")
+    except (httpx.HTTPError, orjson.JSONDecodeError) as e:
+        app.logger.error("Error fetching train station suggestions: %s", e)
         return jsonify({"items": [], "error": str(e)}), 500
 
 
@@ -297,47 +552,32 @@ def train_search():
         app.logger.error("Train search: Invalid JSON received.")
         abort(400, "Invalid JSON")
 
-    create_url = f"{CONTENT_API_BASE}/train-searches"
-    headers = {
-        "x-api-key": API_KEY,
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-    }
-    app.logger.info(
-        f"Requesting train search creation with body: {body} to URL: {create_url}"
-    )
+    create_url = _URL_TS
+    if app.logger.isEnabledFor(logging.DEBUG):
+        app.logger.debug(
+            "Requesting train search creation with body: %s to URL: %s",
+            body,
+            create_url,
+        )
 
     try:
-        resp = requests.post(create_url, json=body, headers=headers)
-        app.logger.info(
-            f"Train search creation response status: {resp.status_code}, Text: {resp.text[:200]}"
-        )  # Log snippet of text
+        resp = _post_json(create_url, body)
+        app.logger.info("Train search creation response status: %s", resp.status_code)
+        if app.logger.isEnabledFor(logging.DEBUG):
+            # Log snippet of text
+            app.logger.debug("Train search creation response text: %s", resp.text[:200])
         resp.raise_for_status()  # Check for HTTP errors for search creation
 
         loc = resp.headers.get("Location", "")
-        app.logger.info(f"Location header from train search creation: {loc}")
-
-        train_search_id = None
-        if loc:
-            parts = loc.strip("/").split("/")
-            # Expecting .../train-searches/{train_search_id}/offers (new) OR .../train-searches/{train_search_id} (old)
-            if (
-                len(parts) >= 2
-                and parts[-1] == "offers"
-                and parts[-3] == "train-searches"
-            ):
-                potential_match = parts[-2]
-                if potential_match.startswith("train_search_"):
-                    train_search_id = potential_match
-            elif len(parts) >= 1 and parts[-2] == "train-searches":
-                potential_match = parts[-1]
-                if potential_match.startswith("train_search_"):
-                    train_search_id = potential_match
-
-        app.logger.info(f"Extracted train_search_id: {train_search_id}")
+        app.logger.info("Location header from train search creation: %s", loc)
+
+        m = _TS_RE.search(loc)
+        train_search_id = m.group(1) if m else None
+
+        app.logger.info("Extracted train_search_id: %s", train_search_id)
         if not train_search_id:
             app.logger.error(
-                f"Could not reliably extract train_search_id from Location: {loc}"
+                "Could not reliably extract train_search_id from Location: %s", loc
             )
             abort(
                 500,
@@ -347,7 +587,7 @@ def train_search():
         offers = poll_for_train_offers(train_search_id)
         return jsonify(offers or {"items": []})
 
-    except requests.exceptions.HTTPError as e:
+    except httpx.HTTPStatusError as e:
         # Log the error and response if available
         error_message = f"Train search Content API error: {e}"
         if e.response is not None:
@@ -366,7 +606,7 @@ def train_search():
         app.logger.error(error_message)
         abort(500, description=error_message)  # Fallback generic error
     except Exception as e:
-        app.logger.error(f"Unexpected error in /train-search: {str(e)}")
+        app.logger.error("Unexpected error in /train-search: %s", e)
         abort(500, str(e))
 
 
@@ -378,49 +618,56 @@ def request_cancellation():
         abort(400, "Invalid JSON or missing bookingId")
 
     booking_id = payload["bookingId"]
-    url = f"{CONTENT_API_BASE}/cancellations/request"
-    headers = {
-        "x-api-key": API_KEY,
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-    }
+    url = _URL_CANCEL
     app.logger.info(
-        f"Proxying booking cancellation request. Target URL: {url}, Booking ID in payload: {payload.get('bookingId')}"
+        "Proxying booking cancellation request. Target URL: %s, Booking ID in payload: %s",
+        url,
+        payload.get("bookingId"),
     )
 
     try:
         app.logger.info(
-            f"Attempting to POST to Content API for booking {booking_id} at {url}"
+            "Attempting to POST to Content API for booking %s at %s", booking_id, url
         )
-        resp = requests.post(url, json=payload, headers=headers, timeout=15)
+        resp = _post_json(url, payload, timeout=15)
         app.logger.info(
-            f"Content API POST call completed for booking {booking_id}. Status: {resp.status_code if resp else 'No response object'}"
+            "Content API POST call completed for booking %s. Status: %s",
+            booking_id,
+            resp.status_code if resp else "No response object",
         )
 
         response_text = resp.text
         app.logger.debug(
-            f"Booking cancellation request response status: {resp.status_code}, Text: {response_text[:200]}"
+            "Booking cancellation request response status: %s, Text: %s",
+            resp.status_code,
+            response_text[:200],
         )
-        if not resp.ok:
+        if not resp.is_success:
             app.logger.error(
-                f"Booking cancellation request failed for {booking_id}: {resp.status_code} - {response_text}"
+                "Booking cancellation request failed for %s: %s - %s",
+                booking_id,
+                resp.status_code,
+                response_text,
             )
-            try:
-                return jsonify(resp.json()), resp.status_code
-            except ValueError:
-                return (
-                    jsonify(
-                        {
-                            "error": "Cancellation request failed",
-                            "details": response_text,
-                        }
-                    ),
-                    resp.status_code,
-                )
+            passthrough = _json_passthrough(resp)
+            if passthrough is not None:
+                return passthrough
+            return (
+                jsonify(
+                    {
+                        "error": "Cancellation request failed",
+                        "details": response_text,
+                    }
+                ),
+                resp.status_code,
+            )
+        passthrough = _json_passthrough(resp)
+        if passthrough is not None:
+            return passthrough
         return jsonify(resp.json()), resp.status_code
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         app.logger.error(
-            f"Content API call timed out for booking {booking_id} at {url}"
+            "Content API call timed out for booking %s at %s", booking_id, url
         )
         return (
             jsonify(
@@ -431,9 +678,12 @@ def request_cancellation():
             ),
             504,
         )
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         app.logger.error(
-            f"Network error during booking cancellation for {booking_id} to {url}: {e}"
+            "Network error during booking cancellation for %s to %s: %s",
+            booking_id,
+            url,
+            e,
         )
         return (
             jsonify(
@@ -446,7 +696,10 @@ def request_cancellation():
         )
     except Exception as e:
         app.logger.error(
-            f"Unexpected error during booking cancellation for {booking_id} to {url}: {e}"
+            "Unexpected error during booking cancellation for %s to %s: %s",
+            booking_id,
+            url,
+            e,
         )
         return (
             jsonify({"error": "An unexpected error occurred", "details": str(e)}),
@@ -459,46 +712,53 @@ def confirm_booking_cancellation(booking_id):
     payload = request.get_json()
     if not payload:
         app.logger.error(
-            f"Confirm cancellation for booking {booking_id}: Invalid JSON."
+            "Confirm cancellation for booking %s: Invalid JSON.", booking_id
         )
         abort(400, "Invalid JSON")
 
-    url = f"{CONTENT_API_BASE}/bookings/{booking_id}/confirm-cancellation"
-    headers = {
-        "x-api-key": API_KEY,
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-    }
+    url = f"{_URL_BOOK}/{booking_id}/confirm-cancellation"
     app.logger.info(
-        f"Proxying booking confirm cancellation to URL: {url} for booking ID: {booking_id}"
+        "Proxying booking confirm cancellation to URL: %s for booking ID: %s",
+        url,
+        booking_id,
     )
 
     try:
-        resp = requests.post(url, json=payload, headers=headers)
+        resp = _post_json(url, payload)
         response_text = resp.text
         app.logger.debug(
-            f"Booking confirm cancellation response status: {resp.status_code}, Text: {response_text[:200]}"
+            "Booking confirm cancellation response status: %s, Text: %s",
+            resp.status_code,
+            response_text[:200],
         )
-        if not resp.ok:
+        if not resp.is_success:
             app.logger.error(
-                f"Booking confirm cancellation failed for {booking_id}: {resp.status_code} - {response_text}"
+                "Booking confirm cancellation failed for %s: %s - %s",
+                booking_id,
+                resp.status_code,
+                response_text,
             )
-            try:
-                return jsonify(resp.json()), resp.status_code
-            except ValueError:
-                return (
-                    jsonify(
-                        {
-                            "error": "Confirm cancellation failed",
-                            "details": response_text,
-                        }
-                    ),
-                    resp.status_code,
-                )
+            passthrough = _json_passthrough(resp)
+            if passthrough is not None:
+                return passthrough
+            return (
+                jsonify(
+                    {
+                        "error": "Confirm cancellation failed",
+                        "details": response_text,
+                    }
+                ),
+                resp.status_code,
+            )
+        passthrough = _json_passthrough(resp)
+        if passthrough is not None:
+            return passthrough
         return jsonify(resp.json()), resp.status_code
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         app.logger.error(
-            f"Network error during confirm booking cancellation for {booking_id}: {e}"
+            "Network error during confirm booking cancellation for %s: %s",
+            booking_id,
+            e,
         )
         return (
             jsonify(
@@ -511,7 +771,9 @@ def confirm_booking_cancellation(booking_id):
         )
     except Exception as e:
         app.logger.error(
-            f"Unexpected error during confirm booking cancellation for {booking_id}: {e}"
+            "Unexpected error during confirm booking cancellation for %s: %s",
+            booking_id,
+            e,
         )
         return (
             jsonify({"error": "An unexpected error occurred", "details": str(e)}),
@@ -526,7 +788,8 @@ def multimodal_search():
         app.logger.error("Multimodal search: Invalid JSON received.")
         abort(400, "Invalid JSON")
 
-    app.logger.info(f"Multimodal search request with body: {body}")
+    if app.logger.isEnabledFor(logging.DEBUG):
+        app.logger.debug("Multimodal search request with body: %s", body)
 
     try:
         origin = body.get("origin")
@@ -546,38 +809,40 @@ def multimodal_search():
         # Use codes directly if they look like airport codes, otherwise resolve
         if is_airport_code(origin):
             origin_code = origin
-            app.logger.info(f"Using origin '{origin}' as airport code directly")
+            app.logger.info("Using origin '%s' as airport code directly", origin)
         else:
             try:
                 origin_locations = resolve_location(origin)
                 if not origin_locations:
-                    app.logger.error(f"No locations found for origin: {origin}")
+                    app.logger.error("No locations found for origin: %s", origin)
                     abort(404, f"No locations found for origin: {origin}")
                 origin_code = origin_locations[0]["code"]
-                app.logger.info(f"Resolved origin '{origin}' to code '{origin_code}'")
+                app.logger.info(
+                    "Resolved origin '%s' to code '%s'", origin, origin_code
+                )
             except Exception as e:
-                app.logger.error(f"Error resolving origin location: {str(e)}")
+                app.logger.error("Error resolving origin location: %s", e)
                 abort(500, f"Error resolving origin location: {str(e)}")
 
         if is_airport_code(destination):
             dest_code = destination
             app.logger.info(
-                f"Using destination '{destination}' as airport code directly"
+                "Using destination '%s' as airport code directly", destination
             )
         else:
             try:
                 destination_locations = resolve_location(destination)
                 if not destination_locations:
                     app.logger.error(
-                        f"No locations found for destination: {destination}"
+                        "No locations found for destination: %s", destination
                     )
                     abort(404, f"No locations found for destination: {destination}")
                 dest_code = destination_locations[0]["code"]
                 app.logger.info(
-                    f"Resolved destination '{destination}' to code '{dest_code}'"
+                    "Resolved destination '%s' to code '%s'", destination, dest_code
                 )
             except Exception as e:
-                app.logger.error(f"Error resolving destination location: {str(e)}")
+                app.logger.error("Error resolving destination location: %s", e)
                 abort(500, f"Error resolving destination location: {str(e)}")
 
         # Perform multimodal search
@@ -588,7 +853,8 @@ def multimodal_search():
 
             # Debug: Log the first result to see its structure
             if results:
-                app.logger.info(f"Sample result structure: {results[0]}")
+                if app.logger.isEnabledFor(logging.DEBUG):
+                    app.logger.debug("Sample result structure: %s", results[0])
             else:
                 app.logger.info("No results returned from search")
 
@@ -643,21 +909,22 @@ def multimodal_search():
                     itineraries.append(itinerary)
                 except Exception as e:
                     app.logger.warning(
-                        f"Error processing itinerary: {e}, skipping this result"
+                        "Error processing itinerary: %s, skipping this result", e
                     )
                     continue
 
-            app.logger.info(f"Multimodal search found {len(itineraries)} itineraries")
+            app.logger.info("Multimodal search found %s itineraries", len(itineraries))
             return jsonify({"itineraries": itineraries})
 
         except Exception as e:
-            app.logger.error(f"Error performing multimodal search: {str(e)}")
+            app.logger.error("Error performing multimodal search: %s", e)
             abort(500, f"Error performing multimodal search: {str(e)}")
 
     except Exception as e:
-        app.logger.error(f"Unexpected error in multimodal search: {str(e)}")
+        app.logger.error("Unexpected error in multimodal search: %s", e)
         abort(500, f"Unexpected error: {str(e)}")
 
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=4000, debug=True)
+    # Dev server only; production runs under gunicorn (see gunicorn.conf.py).
+    app.run(host="0.0.0.0", port=4000, debug=os.getenv("FLASK_DEBUG") == "1")
@@ -0,0 +1,12 @@
+import multiprocessing
+import os
+
+# Production server settings: gunicorn -c gunicorn.conf.py app:app
+bind = os.getenv("BIND", "0.0.0.0:4000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+# Offer polling blocks for up to a minute, so each worker serves many requests
+# on threads instead of one at a time.
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", 16))
+keepalive = 75
+timeout = 120
@@ -1,5 +1,6 @@
-import os, requests, functools, datetime as dt
-from cachetools import TTLCache, cached
+import os, re, socket, requests, functools, threading, time
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -7,14 +8,64 @@ load_dotenv()
 BASE = os.getenv("TEQUILA_ENDPOINT", "https://api.tequila.kiwi.com")
 HEADERS = {"apikey": os.getenv("TEQUILA_API_KEY")}
 
-loc_cache = TTLCache(maxsize=5_000, ttl=1_800)
 
+class _TunedAdapter(HTTPAdapter):
+    """HTTPAdapter whose sockets keep TCP_NODELAY (urllib3's default) and add SO_KEEPALIVE."""
 
-@cached(loc_cache)
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = HTTPConnection.default_socket_options + [
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        ]
+        super().init_poolmanager(*args, **kwargs)
+
+
+# Shared keep-alive session for all Tequila calls.
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.mount(BASE, _TunedAdapter(pool_connections=10, pool_maxsize=50))
+
+_SHARDS = 16
+
+
+def location_cache(maxsize=5_000, ttl=1_800):
+    """TTL cache keyed on (normalized term, limit), split into lock-per-shard dicts.
+
+    Normalizing the term means "LHR" and " lhr " share one entry, and sharding
+    keeps concurrent lookups from serializing on a single cache lock.
+    """
+    shard_size = max(1, maxsize // _SHARDS)
+    shards = [{} for _ in range(_SHARDS)]
+    locks = [threading.Lock() for _ in range(_SHARDS)]
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(term: str, limit: int = 5):
+            key = (term.strip().lower(), limit)
+            idx = hash(key) & (_SHARDS - 1)
+            shard, lock = shards[idx], locks[idx]
+            with lock:
+                hit = shard.get(key)
+            if hit and hit[0] > time.monotonic():
+                return hit[1]
+
+            value = fn(key[0], limit)
+            with lock:
+                shard.pop(key, None)
+                if len(shard) >= shard_size:
+                    # Evict the oldest insertion.
+                    del shard[next(iter(shard))]
+                shard[key] = (time.monotonic() + ttl, value)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+@location_cache(maxsize=5_000, ttl=1_800)
 def resolve_location(term: str, limit: int = 5):
-    resp = requests.get(
+    resp = SESSION.get(
         f"{BASE}/locations/query",
-        headers=HEADERS,
         params={
             "term": term,
             "locale": "en-US",
@@ -28,14 +79,18 @@ def resolve_location(term: str, limit: int = 5):
     return resp.json()["locations"]
 
 
-def search_multimodal(fly_from, fly_to, date_from, date_to, adults=1, currency="GBP"):
-    def convert_date_format(date_str):
-        try:
-            date_obj = dt.datetime.strptime(date_str, "%Y-%m-%d")
-            return date_obj.strftime("%d/%m/%Y")
-        except ValueError:
-            return date_str
+_DATE_RE = re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})$")
 
+
+def convert_date_format(date_str):
+    """YYYY-MM-DD -> DD/MM/YYYY as Tequila expects; anything else passes through."""
+    m = _DATE_RE.match(date_str)
+    if not m:
+        return date_str
+    return f"{int(m.group(3)):02d}/{int(m.group(2)):02d}/{m.group(1)}"
+
+
+def search_multimodal(fly_from, fly_to, date_from, date_to, adults=1, currency="GBP"):
     params = {
         "fly_from": fly_from,
         "fly_to": fly_to,
@@ -45,6 +100,6 @@ def search_multimodal(fly_from, fly_to, date_from, date_to, adults=1, currency="
         "curr": currency,
         "limit": 10,
     }
-    r = requests.get(f"{BASE}/v2/search", headers=HEADERS, params=params, timeout=15)
+    r = SESSION.get(f"{BASE}/v2/search", params=params, timeout=15)
     r.raise_for_status()
     return r.json()["data"]